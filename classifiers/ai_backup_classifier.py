@@ -4,18 +4,60 @@ AI备用分类器
 """
 import asyncio
 import logging
-import re
 from typing import Dict, List, Optional
-from urllib.parse import urlparse
-from openai import OpenAI
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI
 
 from models.bookmark import Bookmark, ClassifiedBookmark
 from config import config
-from utils.decorators import async_timing, async_retry
+from utils import jsonutil
+from utils.decorators import async_timing
 from utils.logger import get_logger
+from utils.concurrency import DynamicSemaphore
+from classifiers.category_normalizer import resolve_category
+from classifiers.response_cache import response_cache
+from classifiers.retry_policy import api_retry
 
 logger = get_logger("bookmark_organizer")
 
+# 预先join好的类别显示字符串，避免每次构建提示词时重复join
+_categories_display = config.categories_display
+
+# 静态提示词头部：固定角色说明、类别范围与输出格式
+# 保持逐字节一致并置于提示词开头，使DeepSeek/OpenAI的前缀缓存能够命中
+_STATIC_PROMPT_HEADER = f"""你是一个快速分类助手。在无法读取网页内容时，请依据 URL 结构和常识完成分类。
+
+分类范围（只能从以下中文类别中选择）：
+{_categories_display}
+
+输出要求：
+1) 网站名称：由域名/路径推断，避免“无标题”；
+2) 网站描述：≤50字，依据URL关键词归纳主要用途；
+3) 网站分类：严格在上述中文类别中；
+4) 网站链接：保持原样；
+
+只输出一个JSON对象，不要输出任何其他内容：
+{{"name": "网站名称", "desc": "网站描述", "cat": "网站分类", "url": "网站链接"}}"""
+
+# 完整提示词模板在模块加载时拼接一次，热路径上仅format_map动态尾部
+# 静态头部中的字面花括号（JSON示例）需转义以免被format_map解析
+_PROMPT_TEMPLATE = (
+    _STATIC_PROMPT_HEADER.replace("{", "{{").replace("}", "}}")
+    + """
+
+---
+URL分析信息：
+- 完整URL: {full_url}
+- 域名: {domain}
+- 主域名: {main_domain}
+- 子域名: {subdomain}
+- 路径: {path}
+- 关键词: {keywords}
+
+基础信息：
+- 标题：{title}
+- 描述：{description}"""
+)
+
 
 class AIBackupClassifier:
     """
@@ -23,25 +65,26 @@ class AIBackupClassifier:
     当无法获取网站元数据时，基于URL和域名信息进行分类
     """
     
-    def __init__(self, max_concurrency: int = None):
+    def __init__(self, max_concurrency: int = None, client: AsyncOpenAI = None):
         """
         初始化AI备用分类器
-        
+
         Args:
             max_concurrency: 最大并发数，如果为None则使用配置中的默认值
+            client: 共享的AsyncOpenAI客户端，如果为None则创建新实例
         """
         self.max_concurrency = max_concurrency or config.network.max_concurrency
-        self.semaphore = asyncio.Semaphore(self.max_concurrency)
-        
-        # 初始化OpenAI客户端
-        self.client = OpenAI(
+        self.semaphore = DynamicSemaphore(self.max_concurrency)
+
+        # 初始化异步OpenAI客户端（优先复用传入的客户端以共享连接池）
+        self.client = client or AsyncOpenAI(
             api_key=config.api_key,
             base_url=config.api_base_url,
         )
-        
+
         logger.info(f"初始化AI备用分类器，最大并发数: {self.max_concurrency}")
     
-    @async_retry(max_attempts=2, delay=1.0)
+    @api_retry
     async def classify_single(self, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
         """
         分类单个书签
@@ -53,50 +96,65 @@ class AIBackupClassifier:
             分类后的书签，如果失败则返回None
         """
         async with self.semaphore:
-            return await asyncio.to_thread(self._sync_classify_single, bookmark)
-    
-    def _sync_classify_single(self, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
+            return await self._classify_single(bookmark)
+
+    async def _classify_single(self, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
         """
-        同步分类单个书签
-        
+        分类单个书签的具体实现
+
         Args:
             bookmark: 要分类的书签
-            
+
         Returns:
             分类后的书签，如果失败则返回None
         """
         try:
             # 提取URL信息
             url_info = self._extract_url_info(bookmark.url)
-            
+
             # 构建提示词
             prompt = self._build_prompt(bookmark, url_info)
-            
-            # 调用AI API
-            response = self.client.chat.completions.create(
-                model=config.ai.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=config.ai.temperature,
-                max_tokens=config.ai.max_tokens,
-                top_p=config.ai.top_p,
-                presence_penalty=config.ai.presence_penalty,
-                frequency_penalty=config.ai.frequency_penalty,
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                logger.warning(f"AI返回空内容: {bookmark.url}")
-                return None
-            
+
+            # 查询响应缓存，命中则跳过API调用
+            cache_key = response_cache.make_key(config.ai.model, prompt)
+            content = response_cache.get(cache_key)
+            from_cache = content is not None
+
+            if content is None:
+                # 调用AI API
+                response = await self.client.chat.completions.create(
+                    model=config.ai.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=config.ai.temperature,
+                    max_tokens=config.ai.max_tokens,
+                    top_p=config.ai.top_p,
+                    presence_penalty=config.ai.presence_penalty,
+                    frequency_penalty=config.ai.frequency_penalty,
+                    response_format={"type": "json_object"},
+                )
+
+                content = response.choices[0].message.content
+                if not content:
+                    logger.warning(f"AI返回空内容: {bookmark.url}")
+                    return None
+            else:
+                logger.debug(f"响应缓存命中: {bookmark.url}")
+
             # 解析AI响应
             classified = self._parse_ai_response(content, bookmark)
             if classified:
+                # 仅未命中时回填缓存，命中路径不重复支付sqlite写入
+                if not from_cache:
+                    response_cache.put(cache_key, content)
                 logger.debug(f"备用分类成功: {bookmark.url} -> {classified.category}")
                 return classified
             
+        except (APIConnectionError, APIStatusError):
+            # 网络/服务端错误向上传播，由重试策略决定是否重试
+            raise
         except Exception as e:
             logger.error(f"备用分类书签 {bookmark.url} 时失败: {e}")
-        
+
         return None
     
     def _extract_url_info(self, url: str) -> Dict[str, str]:
@@ -110,34 +168,71 @@ class AIBackupClassifier:
             包含域名、路径等信息的字典
         """
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            path = parsed.path.lower()
-            query = parsed.query.lower()
-            
-            # 提取子域名和主域名
-            domain_parts = domain.split('.')
-            if len(domain_parts) >= 2:
-                main_domain = '.'.join(domain_parts[-2:])
-                subdomain = '.'.join(domain_parts[:-2]) if len(domain_parts) > 2 else ""
+            # 单次小写后用str.find手工切分，避免urlparse的多轮正则/拆分开销
+            lowered = url.lower()
+
+            # 去掉片段部分
+            fragment_start = lowered.find('#')
+            if fragment_start != -1:
+                lowered = lowered[:fragment_start]
+
+            # 定位scheme结束位置
+            scheme_end = lowered.find('://')
+            rest_start = scheme_end + 3 if scheme_end != -1 else 0
+
+            # 域名在下一个'/'或'?'处结束
+            netloc_end = lowered.find('/', rest_start)
+            query_start = lowered.find('?', rest_start)
+            if netloc_end == -1 or (query_start != -1 and query_start < netloc_end):
+                netloc_end = query_start
+
+            if netloc_end == -1:
+                domain = lowered[rest_start:]
+                path = ""
+                query = ""
+            else:
+                domain = lowered[rest_start:netloc_end]
+                if query_start == -1:
+                    path = lowered[netloc_end:]
+                    query = ""
+                else:
+                    path = lowered[netloc_end:query_start]
+                    query = lowered[query_start + 1:]
+
+            # 提取子域名和主域名，rpartition避免构建完整标签列表
+            head, sep, tld = domain.rpartition('.')
+            if sep:
+                subdomain, sub_sep, sld = head.rpartition('.')
+                if sub_sep:
+                    main_domain = f"{sld}.{tld}"
+                else:
+                    main_domain = domain
+                    subdomain = ""
             else:
                 main_domain = domain
                 subdomain = ""
-            
+
             # 提取关键词
             keywords = []
             if subdomain:
                 keywords.append(subdomain)
-            
-            # 从路径中提取关键词
-            path_keywords = [part for part in path.split('/') if part and len(part) > 2]
-            keywords.extend(path_keywords)
-            
+
+            # 从路径中提取关键词，按'/'逐段切片避免中间列表过滤
+            start = 0
+            path_len = len(path)
+            while start < path_len:
+                end = path.find('/', start + 1)
+                if end == -1:
+                    end = path_len
+                part = path[start:end].lstrip('/')
+                if len(part) > 2:
+                    keywords.append(part)
+                start = end
+
             # 从查询参数中提取关键词
             if query:
-                query_keywords = [part for part in query.split('&') if part and '=' in part]
-                keywords.extend(query_keywords)
-            
+                keywords.extend(part for part in query.split('&') if part and '=' in part)
+
             return {
                 "domain": domain,
                 "main_domain": main_domain,
@@ -146,7 +241,7 @@ class AIBackupClassifier:
                 "keywords": keywords,
                 "full_url": url
             }
-            
+
         except Exception as e:
             logger.warning(f"解析URL失败 {url}: {e}")
             return {
@@ -169,86 +264,59 @@ class AIBackupClassifier:
         Returns:
             提示词字符串
         """
-        categories_str = "、".join(config.categories)
-        
-        # 构建URL分析信息
-        url_analysis = f"""
-URL分析信息：
-- 完整URL: {url_info['full_url']}
-- 域名: {url_info['domain']}
-- 主域名: {url_info['main_domain']}
-- 子域名: {url_info['subdomain']}
-- 路径: {url_info['path']}
-- 关键词: {', '.join(url_info['keywords']) if url_info['keywords'] else '无'}
-"""
-        
-        prompt = f"""
-你是一个快速分类助手。在无法读取网页内容时，请依据 URL 结构和常识完成分类。
-
-{url_analysis}
-
-基础信息：
-- 标题：{bookmark.title}
-- 描述：{bookmark.description}
-
-分类范围（只能从以下中文类别中选择）：
-编程、AI、VPN、在线工具、娱乐、电子商务、供应厂商、社交、资讯、专业设计
-
-输出要求：
-1) 网站名称：由域名/路径推断，避免“无标题”；
-2) 网站描述：≤50字，依据URL关键词归纳主要用途；
-3) 网站分类：严格在上述中文类别中；
-4) 网站链接：保持原样；
-
-只按以下四行原样输出：
-网站名称：xxx
-网站描述：xxx
-网站分类：xxx
-网站链接：xxx
-"""
-        return prompt.strip()
+        # 静态指令在前、动态数据在后，保证提示词前缀跨请求一致以命中前缀缓存
+        mapping = dict(url_info)
+        mapping["keywords"] = ", ".join(url_info["keywords"]) if url_info["keywords"] else "无"
+        mapping["title"] = bookmark.title
+        mapping["description"] = bookmark.description
+        return _PROMPT_TEMPLATE.format_map(mapping)
     
     def _parse_ai_response(self, content: str, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
         """
-        解析AI响应
-        
+        解析AI的JSON响应
+
         Args:
-            content: AI返回的内容
+            content: AI返回的JSON内容
             bookmark: 原始书签对象
-            
+
         Returns:
             解析后的分类书签，如果解析失败则返回None
         """
         try:
-            # 使用正则表达式提取信息
-            match_name = re.search(r"网站名称：(.+)", content)
-            match_desc = re.search(r"网站描述：(.+)", content)
-            match_type = re.search(r"网站分类：(.+)", content)
-            match_url = re.search(r"网站链接：(.+)", content)
-            
-            if match_name and match_desc and match_type and match_url:
-                name = match_name.group(1).strip()
-                description = match_desc.group(1).strip()
-                category = match_type.group(1).strip()
-                url = match_url.group(1).strip()
-                
-                # 验证分类是否在允许的类别中
-                if category not in config.categories:
-                    logger.warning(f"AI返回的分类 '{category}' 不在允许的类别中，使用默认分类")
-                    category = "在线工具"
-                
-                return ClassifiedBookmark(
-                    name=name,
-                    description=description,
-                    category=category,
-                    url=url
-                )
-            else:
-                logger.warning(f"无法解析AI响应: {content}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"解析AI响应时发生错误: {e}")
+            data = jsonutil.loads(content)
+        except Exception:
+            logger.warning(f"无法解析AI响应: {content}")
+            return None
+
+        if not isinstance(data, dict):
+            logger.warning(f"AI响应不是JSON对象: {data}")
+            return None
+
+        name = str(data.get("name") or "").strip()
+        description = str(data.get("desc") or "").strip()
+        category = str(data.get("cat") or "").strip()
+        url = str(data.get("url") or "").strip() or bookmark.url
+
+        if not (name and description and category):
+            logger.warning(f"AI响应字段缺失: {data}")
+            return None
+
+        # 归一化/模糊纠正分类名，仅在完全无法解析时使用默认分类
+        resolved = resolve_category(category)
+        if resolved is None:
+            logger.warning(f"AI返回的分类 '{category}' 不在允许的类别中，使用默认分类")
+            resolved = "在线工具"
+        category = resolved
+
+        try:
+            return ClassifiedBookmark(
+                name=name,
+                description=description,
+                category=category,
+                url=url
+            )
+        except ValueError as e:
+            logger.warning(f"AI响应URL无效: {e}")
             return None
     
     @async_timing
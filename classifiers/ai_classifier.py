@@ -3,19 +3,103 @@ AI分类器
 使用AI模型对书签进行分类
 """
 import asyncio
+import copy
+import itertools
 import logging
-import re
+from collections import defaultdict
 from typing import Dict, List, Optional
-from openai import OpenAI
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncOpenAI,
+    AuthenticationError,
+    PermissionDeniedError,
+)
 
 from models.bookmark import Bookmark, ClassifiedBookmark
 from config import config
-from utils.decorators import async_timing, async_retry
+from utils import jsonutil
+from utils.decorators import async_timing
 from utils.logger import get_logger
+from utils.concurrency import DynamicSemaphore
 from classifiers.ai_backup_classifier import AIBackupClassifier
+from classifiers.category_normalizer import resolve_category
+from classifiers.domain_rules import match_category
+from classifiers.response_cache import response_cache
+from classifiers.retry_policy import api_retry
 
 logger = get_logger("bookmark_organizer")
 
+# 预先join好的类别显示字符串，避免每次构建提示词时重复join
+_categories_display = config.categories_display
+
+# 类别定义，丰富静态指令内容以提升分类质量
+_CATEGORY_DEFINITIONS = """编程：编程语言、开发工具、代码托管、技术文档、开发者社区等软件开发相关网站；
+AI：人工智能模型、AI对话助手、机器学习平台、AIGC创作工具等人工智能相关网站；
+VPN：VPN服务、网络代理、科学上网工具等网络访问辅助网站；
+在线工具：格式转换、文件处理、计算器等浏览器内直接使用的实用工具网站；
+娱乐：视频、音乐、游戏、动漫、直播等休闲娱乐网站；
+电子商务：网上商城、购物平台、二手交易等商品交易网站；
+供应厂商：元器件、原材料、设备制造商与供应商的企业官网；
+社交：社交网络、即时通讯、论坛社区等人际交流网站；
+资讯：新闻门户、行业资讯、博客媒体等信息发布网站；
+专业设计：UI/平面/工业设计工具、素材库、设计师社区等设计相关网站。"""
+
+# 静态提示词头部：固定角色说明、类别定义与输出格式
+# 保持逐字节一致并置于提示词开头，使DeepSeek/OpenAI的前缀缓存能够命中
+_STATIC_PROMPT_HEADER = f"""你是一个高效的中文网站分类助手。根据给定信息输出精炼结果。
+
+分类范围（必须从以下中文类别中二选一）：
+{_categories_display}
+
+类别定义：
+{_CATEGORY_DEFINITIONS}
+
+要求：
+1) 网站名称：提取真实名称，避免“无标题”；
+2) 网站描述：不超过50字，突出主要功能；
+3) 网站分类：严格从上述中文类别中选择；
+4) 网站链接：保持原样；
+
+注意：识别知名站点；标题乱码时结合URL推断；尽量避免滥用“在线工具”。
+
+只输出一个JSON对象，不要输出任何其他内容：
+{{"name": "网站名称", "desc": "网站描述", "cat": "网站分类", "url": "网站链接"}}"""
+
+# 批量分类的静态提示词头部，同样保证前缀一致
+_STATIC_BATCH_HEADER = f"""你是一个高效的中文网站分类助手。根据给定信息为下列每个网站输出精炼结果。
+
+分类范围（必须从以下中文类别中二选一）：
+{_categories_display}
+
+类别定义：
+{_CATEGORY_DEFINITIONS}
+
+要求：
+1) 网站名称：提取真实名称，避免“无标题”；
+2) 网站描述：不超过50字，突出主要功能；
+3) 网站分类：严格从上述中文类别中选择；
+4) 网站链接：保持原样；
+
+注意：识别知名站点；标题乱码时结合URL推断；尽量避免滥用“在线工具”。
+
+只输出一个JSON对象，不要输出任何其他内容，items按输入顺序为每个网站对应一个元素：
+{{"items": [{{"name": "网站名称", "desc": "网站描述", "cat": "网站分类", "url": "网站链接"}}]}}"""
+
+def _escape_braces(text: str) -> str:
+    """转义模板静态部分中的字面花括号（JSON示例），避免被format_map解析"""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+# 完整提示词模板在模块加载时拼接一次，热路径上仅format_map动态尾部
+_PROMPT_TEMPLATE = (
+    _escape_braces(_STATIC_PROMPT_HEADER)
+    + "\n\n---\n待分类网站：\n- 标题：{title}\n- 描述：{description}\n- 链接：{url}"
+)
+
+_BATCH_PROMPT_TEMPLATE = _escape_braces(_STATIC_BATCH_HEADER) + "\n\n---\n待分类网站列表：\n{entries}"
+
 
 class AIClassifier:
     """
@@ -32,24 +116,32 @@ class AIClassifier:
             max_concurrency: 最大并发数，如果为None则使用配置中的默认值
         """
         self.bookmarks = bookmarks
-        self.result: Dict[str, Dict[str, str]] = {}
+        self.result: Dict[str, Dict[str, str]] = defaultdict(dict)
         # 结构化的分类结果列表（用于更丰富的导出场景，如主页/子页面分组）
         self.classified_items: List[ClassifiedBookmark] = []
         self.max_concurrency = max_concurrency or config.network.max_concurrency
-        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.semaphore = DynamicSemaphore(self.max_concurrency)
         
-        # 初始化OpenAI客户端
-        self.client = OpenAI(
+        # 初始化异步OpenAI客户端：HTTP/2在单连接上多路复用，
+        # 避免为每个并发请求建立独立socket和TLS握手
+        self.client = AsyncOpenAI(
             api_key=config.api_key,
             base_url=config.api_base_url,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            ),
         )
-        
-        # 初始化备用分类器
-        self.backup_classifier = AIBackupClassifier(self.max_concurrency)
+
+        # 初始化备用分类器，共享同一客户端以复用连接池
+        self.backup_classifier = AIBackupClassifier(self.max_concurrency, client=self.client)
         
         logger.info(f"初始化AI分类器，书签数量: {len(bookmarks)}")
     
-    @async_retry(max_attempts=2, delay=1.0)
+    @api_retry
     async def classify_single(self, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
         """
         分类单个书签
@@ -61,57 +153,233 @@ class AIClassifier:
             分类后的书签，如果失败则返回None
         """
         async with self.semaphore:
-            return await asyncio.to_thread(self._sync_classify_single, bookmark)
-    
-    def _sync_classify_single(self, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
+            return await self._classify_single(bookmark)
+
+    async def _classify_single(self, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
         """
-        同步分类单个书签
-        
+        分类单个书签的具体实现
+
         Args:
             bookmark: 要分类的书签
-            
+
         Returns:
             分类后的书签，如果失败则返回None
         """
         try:
+            # 知名域名直接按规则分类，跳过LLM调用
+            rule_classified = self._rule_classify(bookmark)
+            if rule_classified is not None:
+                self._record(rule_classified)
+                logger.debug(f"域名规则命中: {bookmark.url} -> {rule_classified.category}")
+                return rule_classified
+
             # 构建提示词
             prompt = self._build_prompt(bookmark)
-            
-            # 调用AI API
-            response = self.client.chat.completions.create(
-                model=config.ai.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=config.ai.temperature,
-                max_tokens=config.ai.max_tokens,
-                top_p=config.ai.top_p,
-                presence_penalty=config.ai.presence_penalty,
-                frequency_penalty=config.ai.frequency_penalty,
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                logger.warning(f"AI返回空内容: {bookmark.title}")
-                return None
-            
+
+            # 查询响应缓存，命中则跳过API调用
+            cache_key = response_cache.make_key(config.ai.model, prompt)
+            content = response_cache.get(cache_key)
+            from_cache = content is not None
+
+            if content is None:
+                # 调用AI API
+                response = await self.client.chat.completions.create(
+                    model=config.ai.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=config.ai.temperature,
+                    max_tokens=config.ai.max_tokens,
+                    top_p=config.ai.top_p,
+                    presence_penalty=config.ai.presence_penalty,
+                    frequency_penalty=config.ai.frequency_penalty,
+                    response_format={"type": "json_object"},
+                )
+
+                content = response.choices[0].message.content
+                if not content:
+                    logger.warning(f"AI返回空内容: {bookmark.title}")
+                    return None
+            else:
+                logger.debug(f"响应缓存命中: {bookmark.title}")
+
             # 解析AI响应
             classified = self._parse_ai_response(content, bookmark)
             if classified:
-                # 添加到结果中
-                key = f"{classified.name} - {classified.description}"
-                if classified.category not in self.result:
-                    self.result[classified.category] = {}
-                self.result[classified.category][key] = classified.url
-                # 保存结构化条目
-                self.classified_items.append(classified)
-                
+                # 仅未命中时回填缓存，命中路径不重复支付sqlite写入
+                if not from_cache:
+                    response_cache.put(cache_key, content)
+                self._record(classified)
+
                 logger.debug(f"成功分类: {bookmark.title} -> {classified.category}")
                 return classified
-            
+
+        except (AuthenticationError, PermissionDeniedError):
+            # 致命错误（无效密钥/无权限），向上传播以快速取消其余任务
+            raise
+        except (APIConnectionError, APIStatusError):
+            # 网络/服务端错误向上传播，由重试策略决定是否重试
+            raise
         except Exception as e:
             logger.error(f"分类书签 {bookmark.title} 时失败: {e}")
-        
+
         return None
-    
+
+    def _rule_classify(self, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
+        """
+        按域名规则表直接分类
+
+        Args:
+            bookmark: 要分类的书签
+
+        Returns:
+            规则命中时返回分类后的书签，否则返回None
+        """
+        matched = match_category(bookmark.url)
+        if matched is None:
+            return None
+
+        domain, category = matched
+        name = bookmark.title if bookmark.title and bookmark.title != "无标题" else domain
+        if bookmark.description and bookmark.description != "无描述":
+            description = bookmark.description[:50]
+        else:
+            description = domain
+
+        return ClassifiedBookmark(
+            name=name,
+            description=description,
+            category=category,
+            url=bookmark.url
+        )
+
+    def _record(self, classified: ClassifiedBookmark) -> None:
+        """
+        记录分类结果
+
+        只追加结构化条目（list.append是原子操作，无需同步）；
+        嵌套的结果字典在classify_all结束时单次构建
+
+        Args:
+            classified: 分类后的书签
+        """
+        self.classified_items.append(classified)
+
+    async def _run_batch(self, batch: List[Bookmark]):
+        """
+        执行单个批次的分类，返回(批次, 结果)便于as_completed关联
+
+        Args:
+            batch: 要分类的书签批次
+
+        Returns:
+            (批次, 分类结果列表) 元组
+        """
+        return batch, await self.classify_batch(batch)
+
+    async def classify_batch(self, batch: List[Bookmark]) -> List[Optional[ClassifiedBookmark]]:
+        """
+        批量分类一组书签
+
+        Args:
+            batch: 要分类的书签批次
+
+        Returns:
+            与批次等长的分类结果列表，失败项为None
+        """
+        async with self.semaphore:
+            return await self._classify_batch(batch)
+
+    async def _classify_batch(self, batch: List[Bookmark]) -> List[Optional[ClassifiedBookmark]]:
+        """
+        批量分类一组书签的具体实现，单次API调用处理整个批次
+
+        Args:
+            batch: 要分类的书签批次
+
+        Returns:
+            与批次等长的分类结果列表，失败项为None
+        """
+        results: List[Optional[ClassifiedBookmark]] = [None] * len(batch)
+
+        try:
+            # 构建批量提示词
+            prompt = self._build_batch_prompt(batch)
+
+            # 查询响应缓存，命中则跳过API调用
+            cache_key = response_cache.make_key(config.ai.model, prompt)
+            content = response_cache.get(cache_key)
+            from_cache = content is not None
+
+            if content is None:
+                # 调用AI API（批次响应按条目数放大token上限）
+                response = await self.client.chat.completions.create(
+                    model=config.ai.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=config.ai.temperature,
+                    max_tokens=config.ai.max_tokens * len(batch),
+                    top_p=config.ai.top_p,
+                    presence_penalty=config.ai.presence_penalty,
+                    frequency_penalty=config.ai.frequency_penalty,
+                    response_format={"type": "json_object"},
+                )
+
+                content = response.choices[0].message.content
+                if not content:
+                    logger.warning(f"AI返回空内容，批次大小: {len(batch)}")
+                    return results
+            else:
+                logger.debug(f"响应缓存命中，批次大小: {len(batch)}")
+
+            # 解析批量JSON响应，items按输入顺序对应各书签
+            try:
+                data = jsonutil.loads(content)
+                items = data.get("items") if isinstance(data, dict) else None
+            except Exception:
+                logger.warning(f"无法解析批量AI响应: {content}")
+                items = None
+
+            if not isinstance(items, list):
+                items = []
+            if len(items) != len(batch):
+                logger.warning(f"批量响应条目数不匹配: 期望 {len(batch)}，实际 {len(items)}")
+
+            parsed_any = False
+            for i, (bookmark, item) in enumerate(zip(batch, items)):
+                classified = self._classified_from_dict(item, bookmark)
+                if classified:
+                    self._record(classified)
+                    results[i] = classified
+                    parsed_any = True
+
+            # 至少解析出一条且为缓存未命中时才写入响应缓存
+            if parsed_any and not from_cache:
+                response_cache.put(cache_key, content)
+
+        except (AuthenticationError, PermissionDeniedError):
+            # 致命错误（无效密钥/无权限），向上传播以快速取消其余任务
+            raise
+        except Exception as e:
+            logger.error(f"批量分类失败: {e}")
+
+        return results
+
+    def _build_batch_prompt(self, batch: List[Bookmark]) -> str:
+        """
+        构建批量分类提示词
+
+        Args:
+            batch: 书签批次
+
+        Returns:
+            提示词字符串
+        """
+        entries = "\n".join(
+            f"{i}) 标题：{bm.title}｜描述：{bm.description}｜链接：{bm.url}"
+            for i, bm in enumerate(batch, 1)
+        )
+
+        # 静态指令在前、动态数据在后，保证提示词前缀跨请求一致以命中前缀缓存
+        return _BATCH_PROMPT_TEMPLATE.format_map({"entries": entries})
+
     def _build_prompt(self, bookmark: Bookmark) -> str:
         """
         构建AI提示词
@@ -122,124 +390,209 @@ class AIClassifier:
         Returns:
             提示词字符串
         """
-        categories_str = "、".join(config.categories)
-        
-        prompt = f"""
-你是一个高效的中文网站分类助手。根据给定信息输出精炼结果。
-
-网站信息：
-- 标题：{bookmark.title}
-- 描述：{bookmark.description}
-- 链接：{bookmark.url}
+        # 静态指令在前、动态数据在后，保证提示词前缀跨请求一致以命中前缀缓存
+        return _PROMPT_TEMPLATE.format_map({
+            "title": bookmark.title,
+            "description": bookmark.description,
+            "url": bookmark.url,
+        })
+    
+    def _parse_ai_response(self, content: str, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
+        """
+        解析AI的JSON响应
 
-分类范围（必须从以下中文类别中二选一）：
-编程、AI、VPN、在线工具、娱乐、电子商务、供应厂商、社交、资讯、专业设计
+        Args:
+            content: AI返回的JSON内容
+            bookmark: 原始书签对象
 
-要求：
-1) 网站名称：提取真实名称，避免“无标题”；
-2) 网站描述：不超过50字，突出主要功能；
-3) 网站分类：严格从上述中文类别中选择；
-4) 网站链接：保持原样；
+        Returns:
+            解析后的分类书签，如果解析失败则返回None
+        """
+        try:
+            data = jsonutil.loads(content)
+        except Exception:
+            logger.warning(f"无法解析AI响应: {content}")
+            return None
 
-注意：识别知名站点；标题乱码时结合URL推断；尽量避免滥用“在线工具”。
+        return self._classified_from_dict(data, bookmark)
 
-只按以下四行原样输出：
-网站名称：xxx
-网站描述：xxx
-网站分类：xxx
-网站链接：xxx
-"""
-        return prompt.strip()
-    
-    def _parse_ai_response(self, content: str, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
+    def _classified_from_dict(self, data, bookmark: Bookmark) -> Optional[ClassifiedBookmark]:
         """
-        解析AI响应
-        
+        从JSON响应字典构建分类书签
+
         Args:
-            content: AI返回的内容
+            data: 响应中的单条JSON对象
             bookmark: 原始书签对象
-            
+
         Returns:
-            解析后的分类书签，如果解析失败则返回None
+            分类后的书签，字段缺失时返回None
         """
+        if not isinstance(data, dict):
+            logger.warning(f"AI响应条目不是JSON对象: {data}")
+            return None
+
+        name = str(data.get("name") or "").strip()
+        description = str(data.get("desc") or "").strip()
+        category = str(data.get("cat") or "").strip()
+        url = str(data.get("url") or "").strip() or bookmark.url
+
+        if not (name and description and category):
+            logger.warning(f"AI响应字段缺失: {data}")
+            return None
+
+        # 归一化/模糊纠正分类名，仅在完全无法解析时使用默认分类
+        resolved = resolve_category(category)
+        if resolved is None:
+            logger.warning(f"AI返回的分类 '{category}' 不在允许的类别中，使用默认分类")
+            resolved = "在线工具"
+        category = resolved
+
         try:
-            # 使用正则表达式提取信息
-            match_name = re.search(r"网站名称：(.+)", content)
-            match_desc = re.search(r"网站描述：(.+)", content)
-            match_type = re.search(r"网站分类：(.+)", content)
-            match_url = re.search(r"网站链接：(.+)", content)
-            
-            if match_name and match_desc and match_type and match_url:
-                name = match_name.group(1).strip()
-                description = match_desc.group(1).strip()
-                category = match_type.group(1).strip()
-                url = match_url.group(1).strip()
-                
-                # 验证分类是否在允许的类别中
-                if category not in config.categories:
-                    logger.warning(f"AI返回的分类 '{category}' 不在允许的类别中，使用默认分类")
-                    category = "在线工具"
-                
-                return ClassifiedBookmark(
-                    name=name,
-                    description=description,
-                    category=category,
-                    url=url
-                )
-            else:
-                logger.warning(f"无法解析AI响应: {content}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"解析AI响应时发生错误: {e}")
+            return ClassifiedBookmark(
+                name=name,
+                description=description,
+                category=category,
+                url=url
+            )
+        except ValueError as e:
+            logger.warning(f"AI响应URL无效: {e}")
             return None
-    
+
     @async_timing
     async def classify_all(self) -> None:
         """
-        分类所有书签，包含备用分类机制
+        分类所有书签，包含批量分类和备用分类机制
         """
         logger.info(f"开始分类 {len(self.bookmarks)} 个书签")
-        
-        # 创建任务
-        tasks = [self.classify_single(bookmark) for bookmark in self.bookmarks]
-        
-        # 并发执行
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 统计结果和收集失败的书签
+
+        # 相同URL只分类一次，结果扇出到所有重复项
+        groups: Dict[str, int] = {}
+        unique_bookmarks: List[Bookmark] = []
+        for bm in self.bookmarks:
+            if bm.url in groups:
+                groups[bm.url] += 1
+            else:
+                groups[bm.url] = 1
+                unique_bookmarks.append(bm)
+
+        dup_count = len(self.bookmarks) - len(unique_bookmarks)
+        if dup_count:
+            logger.info(f"按URL去重 {dup_count} 个重复书签，实际分类 {len(unique_bookmarks)} 个")
+
+        # 知名域名直接按规则分类，只有规则未命中的书签才进入LLM批次
+        rule_hits = 0
+        llm_bookmarks: List[Bookmark] = []
+        for bm in unique_bookmarks:
+            rule_classified = self._rule_classify(bm)
+            if rule_classified is not None:
+                self._record(rule_classified)
+                rule_hits += 1
+            else:
+                llm_bookmarks.append(bm)
+
+        if rule_hits:
+            logger.info(f"域名规则直接分类 {rule_hits} 个书签，{len(llm_bookmarks)} 个交由LLM分类")
+
+        # 按批次切分书签，单次API调用处理一个批次以减少网络往返
+        batch_size = config.ai.batch_size
+        bookmark_iter = iter(llm_bookmarks)
+        batches = []
+        while batch := list(itertools.islice(bookmark_iter, batch_size)):
+            batches.append(batch)
+
+        # 并发执行批量分类，用as_completed流式收集结果：
+        # 遇到致命错误（无效密钥等）立即取消其余任务，避免继续发出注定失败的请求
+        tasks = [asyncio.ensure_future(self._run_batch(batch)) for batch in batches]
+
         success_count = 0
+        fallback_bookmarks = []
+        processed = 0
+
+        try:
+            for future in asyncio.as_completed(tasks):
+                try:
+                    batch, result = await future
+                except (AuthenticationError, PermissionDeniedError) as e:
+                    logger.error(f"遇到致命错误，取消剩余分类任务: {e}")
+                    raise
+                except Exception as e:
+                    # 非致命的批次级异常，整批回退到单条分类
+                    logger.error(f"批量分类任务执行异常: {e}")
+                    continue
+
+                for bookmark, classified in zip(batch, result):
+                    if classified is not None:
+                        success_count += 1
+                    else:
+                        fallback_bookmarks.append(bookmark)
+
+                # 每处理约100个书签记录一次进度
+                if processed // 100 != (processed + len(batch)) // 100:
+                    logger.info(f"分类进度: {processed + len(batch)}/{len(llm_bookmarks)}")
+                processed += len(batch)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        # 任务级异常（非致命）对应的批次需要整批回退
+        for batch, task in zip(batches, tasks):
+            if task.cancelled() or task.exception() is not None:
+                fallback_bookmarks.extend(batch)
+
+        logger.info(f"批量分类完成，成功分类 {success_count}/{len(llm_bookmarks)} 个书签")
+
+        # 批量解析失败的书签回退到单条分类
         failed_bookmarks = []
-        
-        for bookmark, result in zip(self.bookmarks, results):
-            if isinstance(result, Exception):
-                logger.error(f"分类任务执行异常: {result}")
-                failed_bookmarks.append(bookmark)
-            elif result is not None:
-                success_count += 1
-            else:
-                # 分类失败的书签
-                failed_bookmarks.append(bookmark)
-        
-        logger.info(f"主分类完成，成功分类 {success_count}/{len(self.bookmarks)} 个书签")
-        
+        if fallback_bookmarks:
+            logger.info(f"开始单条回退分类 {len(fallback_bookmarks)} 个书签")
+            results = await asyncio.gather(
+                *(self.classify_single(bookmark) for bookmark in fallback_bookmarks),
+                return_exceptions=True
+            )
+
+            for bookmark, result in zip(fallback_bookmarks, results):
+                if isinstance(result, Exception):
+                    logger.error(f"分类任务执行异常: {result}")
+                    failed_bookmarks.append(bookmark)
+                elif result is not None:
+                    success_count += 1
+                else:
+                    # 分类失败的书签
+                    failed_bookmarks.append(bookmark)
+
         # 如果有失败的书签，使用备用分类器
+        backup_success = 0
         if failed_bookmarks:
             logger.info(f"开始备用分类 {len(failed_bookmarks)} 个失败的书签")
             backup_results = await self.backup_classifier.classify_failed_bookmarks(failed_bookmarks)
-            
+
             # 将备用分类结果添加到主结果中
             for classified in backup_results:
-                key = f"{classified.name} - {classified.description}"
-                if classified.category not in self.result:
-                    self.result[classified.category] = {}
-                self.result[classified.category][key] = classified.url
-                # 保存结构化条目
-                self.classified_items.append(classified)
-            
-            logger.info(f"备用分类完成，成功分类 {len(backup_results)}/{len(failed_bookmarks)} 个书签")
-        
-        total_success = success_count + len([r for r in results if r is not None and not isinstance(r, Exception)])
+                self._record(classified)
+
+            backup_success = len(backup_results)
+            logger.info(f"备用分类完成，成功分类 {backup_success}/{len(failed_bookmarks)} 个书签")
+
+        # 将分类结果扇出到被去重的重复书签，保持输出条目数与输入一致
+        fanned_out = 0
+        if dup_count:
+            extra_by_url: Dict[str, int] = {
+                url: count - 1 for url, count in groups.items() if count > 1
+            }
+
+            for item in list(self.classified_items):
+                extra = extra_by_url.pop(item.url, 0)
+                for _ in range(extra):
+                    self._record(copy.copy(item))
+                    fanned_out += 1
+
+        # 所有任务完成后单次构建嵌套结果字典，分类热路径上不再写共享字典
+        for item in self.classified_items:
+            self.result[item.category][f"{item.name} - {item.description}"] = item.url
+
+        total_success = rule_hits + success_count + backup_success + fanned_out
         logger.info(f"总分类完成，成功分类 {total_success}/{len(self.bookmarks)} 个书签")
     
     def get_result(self) -> Dict[str, Dict[str, str]]:
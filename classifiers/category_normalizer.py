@@ -0,0 +1,70 @@
+"""
+分类名称归一化
+将模型返回的近似分类名（多余空格、尾缀"类"/"网站"等）纠正为标准类别
+"""
+from typing import Optional
+
+from config import config
+
+# 去除空白和常见标点的转换表
+_CLEAN_TABLE = {ord(ch): None for ch in " \t\r\n　·、，。！？：；\"'“”‘’（）()[]【】"}
+
+# 模型习惯附加的冗余尾缀，按长度降序逐个剥离
+_STRIP_SUFFIXES = ("网站", "类")
+
+
+def _normalize(name: str) -> str:
+    """
+    归一化分类名：去除空白/标点并剥离冗余尾缀
+
+    Args:
+        name: 原始分类名
+
+    Returns:
+        归一化后的分类名
+    """
+    cleaned = name.translate(_CLEAN_TABLE)
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in _STRIP_SUFFIXES:
+            if len(cleaned) > len(suffix) and cleaned.endswith(suffix):
+                cleaned = cleaned[:-len(suffix)]
+                stripped = True
+    return cleaned
+
+
+# 归一化名到标准类别的映射，O(1)精确查找
+_NORMALIZED_CATEGORIES = {_normalize(category): category for category in config.categories}
+
+
+def resolve_category(raw: str) -> Optional[str]:
+    """
+    将模型返回的分类名解析为标准类别
+
+    先精确匹配，再按归一化名查表，最后尝试前缀匹配，
+    全部未命中时返回None由调用方决定兜底类别。
+
+    Args:
+        raw: 模型返回的分类名
+
+    Returns:
+        标准类别名，无法解析时返回None
+    """
+    if raw in config.categories_set:
+        return raw
+
+    normalized = _normalize(raw)
+    if not normalized:
+        return None
+
+    matched = _NORMALIZED_CATEGORIES.get(normalized)
+    if matched is not None:
+        return matched
+
+    # 前缀匹配兜底：如"专业设"匹配"专业设计"
+    for norm_name, category in _NORMALIZED_CATEGORIES.items():
+        if norm_name.startswith(normalized) or normalized.startswith(norm_name):
+            return category
+
+    return None
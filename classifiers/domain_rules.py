@@ -0,0 +1,266 @@
+"""
+域名分类规则表
+对知名域名直接给出分类结果，跳过LLM调用
+"""
+from typing import Optional, Tuple
+
+# 知名域名到分类的映射（键为主域名或完整域名，小写）
+DOMAIN_RULES = {
+    # 编程
+    "github.com": "编程",
+    "gitlab.com": "编程",
+    "gitee.com": "编程",
+    "bitbucket.org": "编程",
+    "stackoverflow.com": "编程",
+    "stackexchange.com": "编程",
+    "python.org": "编程",
+    "pypi.org": "编程",
+    "npmjs.com": "编程",
+    "nodejs.org": "编程",
+    "golang.org": "编程",
+    "rust-lang.org": "编程",
+    "java.com": "编程",
+    "oracle.com": "编程",
+    "cppreference.com": "编程",
+    "developer.mozilla.org": "编程",
+    "w3schools.com": "编程",
+    "runoob.com": "编程",
+    "csdn.net": "编程",
+    "cnblogs.com": "编程",
+    "juejin.cn": "编程",
+    "segmentfault.com": "编程",
+    "oschina.net": "编程",
+    "leetcode.com": "编程",
+    "leetcode.cn": "编程",
+    "geeksforgeeks.org": "编程",
+    "docker.com": "编程",
+    "kubernetes.io": "编程",
+    "jetbrains.com": "编程",
+    "visualstudio.com": "编程",
+    "vscode.dev": "编程",
+    "readthedocs.io": "编程",
+    "apache.org": "编程",
+    "nginx.org": "编程",
+    "postgresql.org": "编程",
+    "mysql.com": "编程",
+    "redis.io": "编程",
+    "mongodb.com": "编程",
+    "vuejs.org": "编程",
+    "reactjs.org": "编程",
+    "react.dev": "编程",
+    "angular.io": "编程",
+    "springframework.org": "编程",
+    "spring.io": "编程",
+    "maven.org": "编程",
+    "gradle.org": "编程",
+    "git-scm.com": "编程",
+    "linux.org": "编程",
+    "ubuntu.com": "编程",
+    "debian.org": "编程",
+    "archlinux.org": "编程",
+    "kernel.org": "编程",
+    # AI
+    "openai.com": "AI",
+    "chatgpt.com": "AI",
+    "deepseek.com": "AI",
+    "anthropic.com": "AI",
+    "claude.ai": "AI",
+    "gemini.google.com": "AI",
+    "huggingface.co": "AI",
+    "midjourney.com": "AI",
+    "stability.ai": "AI",
+    "moonshot.cn": "AI",
+    "kimi.com": "AI",
+    "doubao.com": "AI",
+    "tongyi.aliyun.com": "AI",
+    "xfyun.cn": "AI",
+    "baichuan-ai.com": "AI",
+    "zhipuai.cn": "AI",
+    "chatglm.cn": "AI",
+    "perplexity.ai": "AI",
+    "poe.com": "AI",
+    "civitai.com": "AI",
+    "ollama.com": "AI",
+    "pytorch.org": "AI",
+    "tensorflow.org": "AI",
+    "kaggle.com": "AI",
+    "colab.research.google.com": "AI",
+    "modelscope.cn": "AI",
+    # 在线工具
+    "tinypng.com": "在线工具",
+    "smallpdf.com": "在线工具",
+    "ilovepdf.com": "在线工具",
+    "convertio.co": "在线工具",
+    "regex101.com": "在线工具",
+    "jsonformatter.org": "在线工具",
+    "caniuse.com": "在线工具",
+    "speedtest.net": "在线工具",
+    "wolframalpha.com": "在线工具",
+    "translate.google.com": "在线工具",
+    "deepl.com": "在线工具",
+    "fanyi.baidu.com": "在线工具",
+    "processon.com": "在线工具",
+    "draw.io": "在线工具",
+    "diagrams.net": "在线工具",
+    "notion.so": "在线工具",
+    "wps.cn": "在线工具",
+    "shimo.im": "在线工具",
+    "yuque.com": "在线工具",
+    # 娱乐
+    "youtube.com": "娱乐",
+    "youtu.be": "娱乐",
+    "bilibili.com": "娱乐",
+    "netflix.com": "娱乐",
+    "twitch.tv": "娱乐",
+    "iqiyi.com": "娱乐",
+    "v.qq.com": "娱乐",
+    "youku.com": "娱乐",
+    "douyin.com": "娱乐",
+    "tiktok.com": "娱乐",
+    "spotify.com": "娱乐",
+    "music.163.com": "娱乐",
+    "y.qq.com": "娱乐",
+    "steampowered.com": "娱乐",
+    "steamcommunity.com": "娱乐",
+    "epicgames.com": "娱乐",
+    "mihoyo.com": "娱乐",
+    "douyu.com": "娱乐",
+    "huya.com": "娱乐",
+    "acfun.cn": "娱乐",
+    "imdb.com": "娱乐",
+    "douban.com": "娱乐",
+    # 电子商务
+    "amazon.com": "电子商务",
+    "amazon.cn": "电子商务",
+    "taobao.com": "电子商务",
+    "tmall.com": "电子商务",
+    "jd.com": "电子商务",
+    "pinduoduo.com": "电子商务",
+    "ebay.com": "电子商务",
+    "aliexpress.com": "电子商务",
+    "shopify.com": "电子商务",
+    "suning.com": "电子商务",
+    "vip.com": "电子商务",
+    "xianyu.com": "电子商务",
+    "goofish.com": "电子商务",
+    # 供应厂商
+    "alibaba.com": "供应厂商",
+    "1688.com": "供应厂商",
+    "made-in-china.com": "供应厂商",
+    "globalsources.com": "供应厂商",
+    "digikey.com": "供应厂商",
+    "mouser.com": "供应厂商",
+    "szlcsc.com": "供应厂商",
+    "ti.com": "供应厂商",
+    "st.com": "供应厂商",
+    "infineon.com": "供应厂商",
+    "nxp.com": "供应厂商",
+    # 社交
+    "twitter.com": "社交",
+    "x.com": "社交",
+    "facebook.com": "社交",
+    "instagram.com": "社交",
+    "linkedin.com": "社交",
+    "reddit.com": "社交",
+    "weibo.com": "社交",
+    "zhihu.com": "社交",
+    "tieba.baidu.com": "社交",
+    "discord.com": "社交",
+    "telegram.org": "社交",
+    "whatsapp.com": "社交",
+    "qq.com": "社交",
+    "wechat.com": "社交",
+    "xiaohongshu.com": "社交",
+    "v2ex.com": "社交",
+    # 资讯
+    "bbc.com": "资讯",
+    "cnn.com": "资讯",
+    "nytimes.com": "资讯",
+    "reuters.com": "资讯",
+    "theguardian.com": "资讯",
+    "news.ycombinator.com": "资讯",
+    "36kr.com": "资讯",
+    "ithome.com": "资讯",
+    "sspai.com": "资讯",
+    "huxiu.com": "资讯",
+    "sina.com.cn": "资讯",
+    "163.com": "资讯",
+    "sohu.com": "资讯",
+    "thepaper.cn": "资讯",
+    "xinhuanet.com": "资讯",
+    "people.com.cn": "资讯",
+    "medium.com": "资讯",
+    "infoq.cn": "资讯",
+    # 专业设计
+    "figma.com": "专业设计",
+    "sketch.com": "专业设计",
+    "canva.com": "专业设计",
+    "canva.cn": "专业设计",
+    "dribbble.com": "专业设计",
+    "behance.net": "专业设计",
+    "zcool.com.cn": "专业设计",
+    "ui.cn": "专业设计",
+    "unsplash.com": "专业设计",
+    "pexels.com": "专业设计",
+    "pixabay.com": "专业设计",
+    "iconfont.cn": "专业设计",
+    "fontawesome.com": "专业设计",
+    "adobe.com": "专业设计",
+    "autodesk.com": "专业设计",
+    "blender.org": "专业设计",
+    "mastergo.com": "专业设计",
+    "js.design": "专业设计",
+}
+
+
+def extract_domain(url: str) -> str:
+    """
+    从URL中快速提取域名（小写，不含端口前的用户信息处理）
+
+    Args:
+        url: 目标URL
+
+    Returns:
+        域名字符串，解析失败时返回空字符串
+    """
+    lowered = url.lower()
+    scheme_end = lowered.find('://')
+    rest_start = scheme_end + 3 if scheme_end != -1 else 0
+
+    netloc_end = len(lowered)
+    for stop in ('/', '?', '#'):
+        pos = lowered.find(stop, rest_start)
+        if pos != -1 and pos < netloc_end:
+            netloc_end = pos
+
+    domain = lowered[rest_start:netloc_end]
+    # 去掉端口
+    port_start = domain.rfind(':')
+    if port_start != -1:
+        domain = domain[:port_start]
+    return domain
+
+
+def match_category(url: str) -> Optional[Tuple[str, str]]:
+    """
+    按域名后缀匹配分类规则
+
+    从完整域名开始逐级去掉最左侧标签查表，
+    例如 docs.github.com -> github.com 命中"编程"。
+
+    Args:
+        url: 目标URL
+
+    Returns:
+        (主域名, 分类) 元组，无规则命中时返回None
+    """
+    domain = extract_domain(url)
+    while domain:
+        category = DOMAIN_RULES.get(domain)
+        if category is not None:
+            return domain, category
+        dot = domain.find('.')
+        if dot == -1:
+            break
+        domain = domain[dot + 1:]
+    return None
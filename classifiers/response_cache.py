@@ -0,0 +1,133 @@
+"""
+AI响应缓存
+缓存AI分类响应，避免对相同提示词重复调用API
+"""
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import config
+from utils.logger import get_logger
+
+logger = get_logger("bookmark_organizer")
+
+
+class ResponseCache:
+    """
+    AI响应缓存类
+    两级缓存：进程内字典 + 磁盘sqlite持久化
+    以 sha1(模型名 + 提示词) 作为缓存键
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        初始化响应缓存
+
+        Args:
+            db_path: sqlite数据库文件路径，如果为None则使用配置中的默认值
+        """
+        self._memory: Dict[str, str] = {}
+        self._db_path = Path(db_path or config.cache_dir) / "cache.sqlite" \
+            if db_path is None else Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """
+        生成缓存键
+
+        Args:
+            model: AI模型名称
+            prompt: 提示词
+
+        Returns:
+            sha1哈希字符串
+        """
+        return hashlib.sha1((model + prompt).encode("utf-8")).hexdigest()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        获取sqlite连接（懒初始化，WAL模式）
+
+        Returns:
+            sqlite3连接对象
+        """
+        if self._conn is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的响应内容，未命中则返回None
+        """
+        # 一级缓存：进程内字典
+        content = self._memory.get(key)
+        if content is not None:
+            return content
+
+        # 二级缓存：sqlite
+        with self._lock:
+            try:
+                row = self._get_conn().execute(
+                    "SELECT content FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"读取响应缓存失败: {e}")
+                return None
+
+        if row is not None:
+            self._memory[key] = row[0]
+            return row[0]
+        return None
+
+    def put(self, key: str, content: str) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            content: 响应内容
+        """
+        self._memory[key] = content
+
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, content) VALUES (?, ?)",
+                    (key, content)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"写入响应缓存失败: {e}")
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._memory.clear()
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"清空响应缓存失败: {e}")
+        logger.info("AI响应缓存已清空")
+
+
+# 全局共享缓存实例，AIClassifier和AIBackupClassifier共用
+response_cache = ResponseCache()
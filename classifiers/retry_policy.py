@@ -0,0 +1,34 @@
+"""
+API调用重试策略
+对限流/超时/服务端错误做带抖动的指数退避重试，永久性4xx错误立即失败
+"""
+from openai import APIConnectionError, APIStatusError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+
+def _is_retryable_error(exc: BaseException) -> bool:
+    """
+    判断异常是否值得重试
+
+    仅重试连接错误、408/429和5xx服务端错误；
+    400/401/403等永久性错误重试只会浪费调用。
+
+    Args:
+        exc: 捕获到的异常
+
+    Returns:
+        是否应当重试
+    """
+    if isinstance(exc, APIStatusError):
+        status = exc.status_code
+        return status in (408, 429) or status >= 500
+    return isinstance(exc, APIConnectionError)
+
+
+# 带随机指数退避的重试装饰器：抖动避免并发任务的重试风暴同步成突发
+api_retry = retry(
+    stop=stop_after_attempt(4),
+    wait=wait_random_exponential(min=1, max=30),
+    retry=retry_if_exception(_is_retryable_error),
+    reraise=True,
+)
@@ -3,8 +3,9 @@
 集中管理项目的所有配置项
 """
 import os
+from pathlib import Path
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from dotenv import load_dotenv
 
 # 加载环境变量
@@ -15,7 +16,8 @@ class AIConfig(BaseModel):
     """AI模型配置"""
     model: str = Field(default="deepseek-chat", description="AI模型名称")
     temperature: float = Field(default=0.3, ge=0.0, le=2.0, description="温度参数")
-    max_tokens: int = Field(default=1024, gt=0, description="最大token数")
+    max_tokens: int = Field(default=128, gt=0, description="最大token数")
+    batch_size: int = Field(default=20, gt=0, description="单次请求批量分类的书签数量")
     top_p: float = Field(default=0.9, ge=0.0, le=1.0, description="Top-p参数")
     presence_penalty: float = Field(default=0.0, ge=-2.0, le=2.0, description="存在惩罚")
     frequency_penalty: float = Field(default=0.0, ge=-2.0, le=2.0, description="频率惩罚")
@@ -26,6 +28,7 @@ class NetworkConfig(BaseModel):
     max_concurrency: int = Field(default=100, gt=0, description="最大并发数")
     timeout: int = Field(default=8, gt=0, description="请求超时时间(秒)")
     max_retries: int = Field(default=2, ge=0, description="最大重试次数")
+    meta_cache_size: int = Field(default=50000, gt=0, description="元数据缓存容量上限")
     user_agent: str = Field(
         default="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
         description="User-Agent"
@@ -43,6 +46,12 @@ class Config(BaseModel):
     # API配置
     api_key: str = Field(..., description="DeepSeek API密钥")
     api_base_url: str = Field(default="https://api.deepseek.com/v1", description="API基础URL")
+
+    # 缓存目录
+    cache_dir: str = Field(
+        default=str(Path.home() / ".cache" / "bookmark_ai"),
+        description="缓存目录"
+    )
     
     # 功能配置
     ai: AIConfig = Field(default_factory=AIConfig, description="AI配置")
@@ -57,6 +66,16 @@ class Config(BaseModel):
         ],
         description="网站分类类别"
     )
+    # 由categories派生的查找结构，避免热路径上的线性扫描和重复join
+    categories_set: frozenset = Field(default=frozenset(), description="分类类别集合")
+    categories_display: str = Field(default="", description="分类类别显示字符串")
+
+    @model_validator(mode="after")
+    def _derive_category_lookups(self) -> "Config":
+        """从categories派生集合和显示字符串"""
+        self.categories_set = frozenset(self.categories)
+        self.categories_display = "、".join(self.categories)
+        return self
 
     @classmethod
     def from_env(cls) -> "Config":
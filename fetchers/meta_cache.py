@@ -0,0 +1,106 @@
+"""
+元数据持久化缓存
+以URL为键在磁盘上缓存网站元数据，重复运行时只需获取新增URL
+"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from config import config
+from utils.logger import get_logger
+
+logger = get_logger("bookmark_organizer")
+
+
+class MetaCache:
+    """
+    元数据持久化缓存类
+    磁盘sqlite存储，以URL为缓存键（结构与AI响应缓存一致）
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        初始化元数据缓存
+
+        Args:
+            db_path: sqlite数据库文件路径，如果为None则使用配置中的默认值
+        """
+        self._db_path = Path(config.cache_dir) / "meta_cache.sqlite" \
+            if db_path is None else Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        获取sqlite连接（懒初始化，WAL模式）
+
+        Returns:
+            sqlite3连接对象
+        """
+        if self._conn is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta "
+                "(url TEXT PRIMARY KEY, title TEXT, description TEXT)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        查询缓存
+
+        Args:
+            url: 目标URL
+
+        Returns:
+            (标题, 描述) 元组，未命中则返回None
+        """
+        with self._lock:
+            try:
+                row = self._get_conn().execute(
+                    "SELECT title, description FROM meta WHERE url = ?", (url,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"读取元数据缓存失败: {e}")
+                return None
+
+        return (row[0], row[1]) if row is not None else None
+
+    def put(self, url: str, title: str, description: str) -> None:
+        """
+        写入缓存
+
+        Args:
+            url: 目标URL
+            title: 网站标题
+            description: 网站描述
+        """
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (url, title, description) VALUES (?, ?, ?)",
+                    (url, title, description)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"写入元数据缓存失败: {e}")
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                conn.execute("DELETE FROM meta")
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"清空元数据缓存失败: {e}")
+        logger.info("元数据持久化缓存已清空")
+
+
+# 全局共享缓存实例
+meta_cache = MetaCache()
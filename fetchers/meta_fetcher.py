@@ -5,23 +5,47 @@
 import asyncio
 import logging
 import random
-import time
-from typing import Dict, Tuple, List
-import requests
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, List
+from urllib.parse import urlparse
+import aiohttp
 from bs4 import BeautifulSoup
-import urllib3
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
 
 from config import config
-from utils.decorators import async_retry
 from utils.logger import get_logger
 
-# 禁用SSL警告
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
 logger = get_logger("bookmark_organizer")
 
+# 快速路径正则：title和描述通常出现在文档头部，
+# 正则命中时可完全跳过DOM构建
+_FAST_PATH_SCAN_SIZE = 16 * 1024
+
+# 正文读取上限：meta标签几乎总在文档头部，
+# 截断读取同时限制网络传输字节数和解析输入大小
+_BODY_READ_CAP = 32 * 1024
+
+# 每域名获胜策略缓存的容量上限
+_DOMAIN_STRATEGY_CAP = 10000
+_TITLE_RE = re.compile(r'<title[^>]*>([^<]{1,300})</title>', re.I)
+_DESC_RE = re.compile(
+    r'<meta[^>]+name=["\']description["\'][^>]+content=["\']([^"\']{1,500})["\']', re.I
+)
+_OG_DESC_RE = re.compile(
+    r'<meta[^>]+property=["\']og:description["\'][^>]+content=["\']([^"\']{1,500})["\']', re.I
+)
+
+# 标题常见冗余后缀（" - 首页"、" | Home"等），单次正则替换代替多次endswith扫描
+_TITLE_SUFFIX_RE = re.compile(r'(?:\s*[-|]\s*(?:首页|Home|官网))+\s*$')
+
+# 预构建的find属性字典与合并后的CSS选择器，
+# 避免每次提取时重建字典和重新编译选择器
+_OG_TITLE_ATTRS = {"property": "og:title"}
+_OG_DESC_ATTRS = {"property": "og:description"}
+_DESC_ATTRS = {"name": "description"}
+_TITLE_FALLBACK_SELECTOR = "h1, h2, h3, .site-title, .brand, .logo, meta[name='application-name']"
+_DESC_FALLBACK_SELECTOR = ".description, .summary, .intro, .content, meta[name='twitter:description']"
+
 # 常用User-Agent列表，用于轮换
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -34,6 +58,48 @@ USER_AGENTS = [
 ]
 
 
+class _SoftFailure(Exception):
+    """请求成功但未能从页面中提取到有效元数据"""
+
+
+class _LRU:
+    """
+    基于OrderedDict的简单LRU缓存
+    超出容量时淘汰最久未使用的条目，避免长时间运行内存无界增长
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        初始化LRU缓存
+
+        Args:
+            maxsize: 缓存容量上限
+        """
+        self._maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存值并刷新其新鲜度，未命中返回None"""
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """写入缓存，容量满时淘汰最旧条目"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class MetaFetcher:
     """
     元数据获取器类
@@ -47,13 +113,68 @@ class MetaFetcher:
         Args:
             max_concurrency: 最大并发数，如果为None则使用配置中的默认值
         """
-        self._cache: Dict[str, Tuple[str, str]] = {}
+        self._cache = _LRU(config.network.meta_cache_size)
+        # 记录每个域名上次成功的策略下标，同域名后续URL直接从该策略开始
+        self._domain_strategy: Dict[str, int] = {}
         self.max_concurrency = max_concurrency or config.network.max_concurrency
-        self.semaphore = asyncio.Semaphore(self.max_concurrency)
-        
+
+        # 共享aiohttp会话在首次请求时惰性创建（必须在事件循环内构建），
+        # 连接器的limit即并发上限，无需额外的信号量和线程池
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._timeout = aiohttp.ClientTimeout(total=config.network.timeout)
+
+        # 预绑定配置值并预构建各策略的请求头，
+        # 避免每次请求的链式属性查找和字典重建
+        self._user_agent = config.network.user_agent
+        self._normal_headers = {"User-Agent": self._user_agent}
+        rotating_base = {
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "Accept-Encoding": "gzip, deflate, br",
+            "DNT": "1",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1",
+        }
+        self._rotating_headers = [
+            {"User-Agent": ua, **rotating_base} for ua in USER_AGENTS
+        ]
+        delayed_base = {
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        self._delayed_headers = [
+            {"User-Agent": ua, **delayed_base} for ua in USER_AGENTS
+        ]
+        self._mobile_headers = {
+            "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Cache-Control": "no-cache",
+            "Pragma": "no-cache",
+        }
+
         logger.info(f"初始化元数据获取器，最大并发数: {self.max_concurrency}")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        获取共享的aiohttp会话，必要时创建
+
+        Returns:
+            共享的ClientSession实例
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, ssl=False)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """关闭共享的aiohttp会话"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
     
-    @async_retry(max_attempts=2, delay=1.0)
     async def get_meta_single(self, url: str) -> Tuple[str, str]:
         """
         获取单个URL的元数据
@@ -64,23 +185,23 @@ class MetaFetcher:
         Returns:
             (标题, 描述) 元组
         """
-        async with self.semaphore:
-            return await asyncio.to_thread(self._sync_get_meta, url)
-    
-    def _sync_get_meta(self, url: str) -> Tuple[str, str]:
+        return await self._async_get_meta(url)
+
+    async def _async_get_meta(self, url: str) -> Tuple[str, str]:
         """
-        同步获取元数据，包含防爬虫绕过机制
-        
+        异步获取元数据，包含防爬虫绕过机制
+
         Args:
             url: 目标URL
-            
+
         Returns:
             (标题, 描述) 元组
         """
         # 检查缓存
-        if url in self._cache:
+        cached = self._cache.get(url)
+        if cached is not None:
             logger.debug(f"从缓存获取元数据: {url}")
-            return self._cache[url]
+            return cached
         
         if not url or not url.startswith(('http', 'https')):
             logger.warning(f"无效的URL: {url}")
@@ -93,149 +214,120 @@ class MetaFetcher:
             self._try_with_delayed_request,
             self._try_with_alternative_headers
         ]
-        
-        for i, strategy in enumerate(strategies):
+
+        # 同域名优先尝试上次成功的策略，避免重复支付前面策略的失败开销
+        netloc = urlparse(url).netloc
+        preferred = self._domain_strategy.get(netloc, 0)
+        order = range(len(strategies)) if preferred == 0 else (
+            [preferred] + [i for i in range(len(strategies)) if i != preferred]
+        )
+
+        for i in order:
             try:
-                result = strategy(url)
-                if result and result[0] != "无标题":
-                    logger.debug(f"策略 {i+1} 成功获取元数据: {url} -> {result[0]}")
-                    self._cache[url] = result
-                    return result
+                result = await strategies[i](url)
+            except _SoftFailure:
+                logger.debug(f"策略 {i+1} 未提取到有效元数据: {url}")
+                continue
             except Exception as e:
                 logger.debug(f"策略 {i+1} 失败 {url}: {e}")
                 continue
+
+            logger.debug(f"策略 {i+1} 成功获取元数据: {url} -> {result[0]}")
+            if netloc in self._domain_strategy or len(self._domain_strategy) < _DOMAIN_STRATEGY_CAP:
+                self._domain_strategy[netloc] = i
+            self._cache.put(url, result)
+            return result
         
         # 所有策略都失败，返回默认值
         logger.warning(f"所有获取策略都失败: {url}")
         result = ("无标题", "无描述")
-        self._cache[url] = result
+        self._cache.put(url, result)
         return result
     
-    def _try_normal_request(self, url: str) -> Tuple[str, str]:
+    async def _fetch_and_extract(self, url: str, headers: Dict[str, str]) -> Tuple[str, str]:
+        """
+        请求URL并从响应HTML中提取元数据
+
+        Args:
+            url: 目标URL
+            headers: 请求头
+
+        Returns:
+            (标题, 描述) 元组
+        """
+        session = self._get_session()
+        async with session.get(url, headers=headers, timeout=self._timeout) as response:
+            response.raise_for_status()
+            # 非HTML响应（PDF、图片、JSON等）直接返回默认值，
+            # 跳过正文下载和解析，换请求头重试也不会改变内容类型
+            content_type = response.headers.get("Content-Type", "").lower()
+            if "html" not in content_type:
+                logger.debug(f"非HTML内容类型 ({content_type or '未知'})，跳过解析: {url}")
+                return "无标题", "无描述"
+            # 只读取正文前32KB，超长页面的剩余部分随连接释放被丢弃
+            body = await response.content.read(_BODY_READ_CAP)
+            try:
+                encoding = response.get_encoding()
+            except RuntimeError:
+                encoding = "utf-8"
+        # 截断可能切断多字节字符，用replace容错解码
+        html_content = body.decode(encoding, errors="replace")
+
+        meta = self._extract_meta_from_html(html_content)
+        if meta is None:
+            raise _SoftFailure(url)
+        return meta
+
+    async def _try_normal_request(self, url: str) -> Tuple[str, str]:
         """标准请求策略"""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=config.network.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        headers = {"User-Agent": config.network.user_agent}
-        response = session.get(
-            url, 
-            timeout=config.network.timeout, 
-            headers=headers, 
-            verify=False
-        )
-        response.raise_for_status()
-        
-        return self._extract_meta_from_html(response.text)
-    
-    def _try_with_rotating_headers(self, url: str) -> Tuple[str, str]:
+        return await self._fetch_and_extract(url, self._normal_headers)
+
+    async def _try_with_rotating_headers(self, url: str) -> Tuple[str, str]:
         """轮换User-Agent策略"""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=config.network.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # 随机选择User-Agent
-        user_agent = random.choice(USER_AGENTS)
-        headers = {
-            "User-Agent": user_agent,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-        }
-        
-        response = session.get(
-            url, 
-            timeout=config.network.timeout, 
-            headers=headers, 
-            verify=False
-        )
-        response.raise_for_status()
-        
-        return self._extract_meta_from_html(response.text)
-    
-    def _try_with_delayed_request(self, url: str) -> Tuple[str, str]:
+        # 从预构建的请求头中随机选择一套（按User-Agent区分）
+        return await self._fetch_and_extract(url, random.choice(self._rotating_headers))
+
+    async def _try_with_delayed_request(self, url: str) -> Tuple[str, str]:
         """延迟请求策略"""
         # 随机延迟0.5-2秒
-        time.sleep(random.uniform(0.5, 2.0))
-        
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=config.network.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        headers = {
-            "User-Agent": random.choice(USER_AGENTS),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-        }
-        
-        response = session.get(
-            url, 
-            timeout=config.network.timeout, 
-            headers=headers, 
-            verify=False
-        )
-        response.raise_for_status()
-        
-        return self._extract_meta_from_html(response.text)
-    
-    def _try_with_alternative_headers(self, url: str) -> Tuple[str, str]:
-        """替代请求头策略"""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=config.network.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # 模拟移动设备
-        headers = {
-            "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-        }
-        
-        response = session.get(
-            url, 
-            timeout=config.network.timeout, 
-            headers=headers, 
-            verify=False
-        )
-        response.raise_for_status()
-        
-        return self._extract_meta_from_html(response.text)
-    
-    def _extract_meta_from_html(self, html_content: str) -> Tuple[str, str]:
-        """从HTML内容中提取元数据"""
-        soup = BeautifulSoup(html_content, "html.parser")
+        await asyncio.sleep(random.uniform(0.5, 2.0))
+
+        return await self._fetch_and_extract(url, random.choice(self._delayed_headers))
+
+    async def _try_with_alternative_headers(self, url: str) -> Tuple[str, str]:
+        """替代请求头策略（模拟移动设备）"""
+        return await self._fetch_and_extract(url, self._mobile_headers)
+
+    @staticmethod
+    def _clean_title(title: str) -> str:
+        """
+        清理标题：移除常见后缀并限制长度
+
+        Args:
+            title: 原始标题
+
+        Returns:
+            清理后的标题
+        """
+        title = _TITLE_SUFFIX_RE.sub('', title)
+
+        if len(title) > 100:
+            title = title[:100] + "..."
+        return title
+
+    def _extract_meta_from_html(self, html_content: str) -> Optional[Tuple[str, str]]:
+        """从HTML内容中提取元数据，未提取到标题时返回None"""
+        # 快速路径：标题和描述通常在文档头部，正则命中即可跳过完整DOM解析
+        head = html_content[:_FAST_PATH_SCAN_SIZE]
+        title_match = _TITLE_RE.search(head)
+        if title_match and title_match.group(1).strip():
+            desc_match = _DESC_RE.search(head) or _OG_DESC_RE.search(head)
+            if desc_match and desc_match.group(1).strip():
+                title = self._clean_title(title_match.group(1).strip())
+                return title, desc_match.group(1).strip()
+
+        # lxml为C实现，解析大页面比纯Python的html.parser快数倍
+        soup = BeautifulSoup(html_content, "lxml")
         
         # 提取标题 - 尝试多种方式
         title = "无标题"
@@ -252,42 +344,31 @@ class MetaFetcher:
         
         # 方法3: 从og:title提取
         if title == "无标题":
-            og_title = soup.find("meta", attrs={"property": "og:title"})
+            og_title = soup.find("meta", attrs=_OG_TITLE_ATTRS)
             if og_title and og_title.get("content"):
                 title = og_title["content"].strip()
-        
-        # 方法4: 从网站名称相关标签提取
+
+        # 方法4: 从网站名称相关标签提取（单次合并选择器查询）
         if title == "无标题":
-            # 尝试从各种可能的标题标签提取
-            for tag in ["h1", "h2", "h3", ".site-title", ".brand", ".logo", "meta[name='application-name']"]:
-                element = soup.select_one(tag)
-                if element and element.get_text().strip():
-                    title = element.get_text().strip()
-                    break
+            element = soup.select_one(_TITLE_FALLBACK_SELECTOR)
+            if element and element.get_text().strip():
+                title = element.get_text().strip()
         
         # 清理标题
         if title != "无标题":
-            # 移除常见的后缀
-            suffixes = [" - 首页", " - Home", " | 首页", " | Home", " - 官网", " | 官网"]
-            for suffix in suffixes:
-                if title.endswith(suffix):
-                    title = title[:-len(suffix)]
-            
-            # 限制标题长度
-            if len(title) > 100:
-                title = title[:100] + "..."
+            title = self._clean_title(title)
         
         # 提取描述 - 尝试多种方式
         description = "无描述"
         
         # 方法1: meta description
-        desc_meta = soup.find("meta", attrs={"name": "description"})
+        desc_meta = soup.find("meta", attrs=_DESC_ATTRS)
         if desc_meta and desc_meta.get("content"):
             description = desc_meta["content"].strip()
-        
+
         # 方法2: og:description
         if description == "无描述":
-            og_desc = soup.find("meta", attrs={"property": "og:description"})
+            og_desc = soup.find("meta", attrs=_OG_DESC_ATTRS)
             if og_desc and og_desc.get("content"):
                 description = og_desc["content"].strip()
         
@@ -299,19 +380,19 @@ class MetaFetcher:
                 text = first_p.get_text().strip()
                 description = text[:100] + "..." if len(text) > 100 else text
         
-        # 方法4: 从其他可能的描述标签提取
+        # 方法4: 从其他可能的描述标签提取（单次合并选择器查询）
         if description == "无描述":
-            for selector in [".description", ".summary", ".intro", ".content", "meta[name='twitter:description']"]:
-                element = soup.select_one(selector)
-                if element:
-                    if element.name == 'meta' and element.get("content"):
-                        text = element.get("content").strip()
-                    else:
-                        text = element.get_text().strip()
-                    if text:
-                        description = text[:100] + "..." if len(text) > 100 else text
-                    break
-        
+            element = soup.select_one(_DESC_FALLBACK_SELECTOR)
+            if element:
+                if element.name == 'meta' and element.get("content"):
+                    text = element.get("content").strip()
+                else:
+                    text = element.get_text().strip()
+                if text:
+                    description = text[:100] + "..." if len(text) > 100 else text
+
+        if title == "无标题":
+            return None
         return title, description
     
     async def get_all(self, urls: List[str]) -> Dict[str, Tuple[str, str]]:
@@ -325,22 +406,27 @@ class MetaFetcher:
             URL到元数据的映射字典
         """
         logger.info(f"开始获取 {len(urls)} 个URL的元数据")
-        
+
+        # 先去重（dict.fromkeys保持顺序），重复URL只请求一次
+        unique_urls = list(dict.fromkeys(urls))
+        if len(unique_urls) < len(urls):
+            logger.info(f"去重后剩余 {len(unique_urls)} 个唯一URL")
+
         # 创建任务
-        tasks = [self.get_meta_single(url) for url in urls]
-        
+        tasks = [self.get_meta_single(url) for url in unique_urls]
+
         # 并发执行
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        
+
         # 处理结果
         url_to_meta = {}
-        for url, result in zip(urls, results):
+        for url, result in zip(unique_urls, results):
             if isinstance(result, Exception):
                 logger.error(f"获取 {url} 元数据时发生异常: {result}")
                 url_to_meta[url] = ("无标题", "无描述")
             else:
                 url_to_meta[url] = result
-        
+
         logger.info(f"成功获取 {len(url_to_meta)} 个URL的元数据")
         return url_to_meta
     
@@ -2,16 +2,21 @@
 书签数据模型
 定义书签相关的数据结构
 """
-from dataclasses import dataclass, field
-from typing import Optional
-from pydantic import BaseModel, HttpUrl, Field
+import re
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
 
+# URL前缀校验正则，构造时校验一次使下游validate_data无需逐条扫描
+_VALID_URL = re.compile(r"^https?://")
 
-@dataclass
+
+@dataclass(slots=True)
 class Bookmark:
     """
     书签数据类
-    
+
+    slots避免每个实例携带__dict__，批量解析上千书签时显著省内存
+
     Attributes:
         title: 书签标题
         url: 书签URL
@@ -41,33 +46,32 @@ class Bookmark:
         return f"{self.title} ({self.url}) - {self.description}"
 
 
-class BookmarkPydantic(BaseModel):
+@dataclass(slots=True)
+class ClassifiedBookmark:
     """
-    书签Pydantic模型
-    用于数据验证和序列化
+    分类后的书签数据类
+
+    Attributes:
+        name: 网站名称
+        description: 网站描述
+        category: 网站分类
+        url: 网站链接
     """
-    title: str = Field(..., description="书签标题")
-    url: str = Field(..., description="书签URL")
-    description: str = Field(default="", description="书签描述")
-    folder: str = Field(default="", description="所属文件夹")
-    add_date: Optional[str] = Field(default=None, description="添加日期")
-    
-    class Config:
-        """Pydantic配置"""
-        validate_assignment = True
-        extra = "forbid"
+    name: str
+    description: str
+    category: str
+    url: str
 
+    def __post_init__(self) -> None:
+        """构造时校验URL前缀，避免无效链接进入导出结果"""
+        if not _VALID_URL.match(self.url):
+            raise ValueError(f"无效的书签URL: {self.url}")
 
-class ClassifiedBookmark(BaseModel):
-    """
-    分类后的书签模型
-    """
-    name: str = Field(..., description="网站名称")
-    description: str = Field(..., description="网站描述")
-    category: str = Field(..., description="网站分类")
-    url: str = Field(..., description="网站链接")
-    
-    class Config:
-        """Pydantic配置"""
-        validate_assignment = True
-        extra = "forbid"
+    def to_dict(self) -> Dict[str, str]:
+        """
+        转换为字典（用于JSON序列化）
+
+        Returns:
+            字段名到值的字典
+        """
+        return asdict(self)
@@ -2,18 +2,76 @@
 书签解析器
 负责解析HTML书签文件并提取书签信息
 """
+import asyncio
+import functools
 import logging
+import re
 from pathlib import Path
-from typing import List
-from bs4 import BeautifulSoup
+from typing import Iterator, List, Tuple
+from lxml import etree
 
 from models.bookmark import Bookmark
+from fetchers.meta_cache import meta_cache
 from fetchers.meta_fetcher import MetaFetcher
 from config import config
 from utils.logger import get_logger
 
 logger = get_logger("bookmark_organizer")
 
+# 元数据缺失的哨兵值，模块级单例避免每个URL重建默认元组
+_MISSING = ("无标题", "无描述")
+
+# 预编译的URL前缀正则（容忍前导空白），
+# 单次C层匹配代替每个锚点的strip+startswith两次Python级扫描
+_HTTP_URL_RE = re.compile(r'^\s*https?://')
+
+@functools.lru_cache(maxsize=8)
+def _extract_urls(path: str, mtime: float) -> Tuple[str, ...]:
+    """
+    流式解析书签文件，提取有效URL
+
+    用lxml的iterparse逐个消费<a>标签并即时释放已处理节点，
+    超大书签导出文件的内存峰值与文件大小无关；
+    按(路径, 修改时间)缓存解析结果，同一文件未修改时的重复解析为O(1)，
+    返回元组以避免缓存的结果被调用方意外修改
+
+    Args:
+        path: 书签文件路径
+        mtime: 文件修改时间（作为缓存键的一部分）
+
+    Returns:
+        有效URL元组
+    """
+    try:
+        # tuple()直接消费生成器，不构建中间列表
+        return tuple(_iter_hrefs(path))
+    except Exception as e:
+        logger.error(f"解析书签文件失败: {e}")
+        raise
+
+
+def _iter_hrefs(path: str) -> Iterator[str]:
+    """
+    逐个产出书签文件中的有效URL
+
+    生成器与iterparse配合，整个提取过程单遍完成且无中间列表
+
+    Args:
+        path: 书签文件路径
+
+    Yields:
+        有效URL字符串
+    """
+    # 只订阅<a>标签的end事件，<DT>/<DL>等节点不会构建Python对象
+    for _, elem in etree.iterparse(path, events=('end',), tag='a', html=True):
+        href = elem.get('href')
+        if href is not None and _HTTP_URL_RE.match(href):
+            yield href.strip()
+        # 释放已处理的节点及其前序兄弟，保持内存O(1)
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
 
 class BookmarkParser:
     """
@@ -45,48 +103,61 @@ class BookmarkParser:
             书签列表
         """
         logger.info("开始解析书签文件")
-        
-        # 读取HTML文件
-        try:
-            with open(self.html_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            logger.error(f"读取书签文件失败: {e}")
-            raise
-        
-        # 解析HTML
-        soup = BeautifulSoup(content, 'html.parser')
-        # 获取链接时保留原始文本作为备选标题
-        links = soup.find_all('a')
-        
-        # 提取URL列表
-        url_list = []
-        for link in links:
-            href = link.get('href', '').strip()
-            if href.startswith(('http', 'https')):
-                url_list.append(href)
-        
+
+        # 提取URL列表（解析结果按文件路径和修改时间缓存）；
+        # 文件读取和解析移入工作线程，避免大文件阻塞事件循环
+        url_list = list(await asyncio.to_thread(
+            _extract_urls, str(self.html_path), self.html_path.stat().st_mtime
+        ))
+
         logger.info(f"从HTML文件中提取到 {len(url_list)} 个有效URL")
         
         if not url_list:
             logger.warning("未找到有效的URL")
             return []
         
-        # 获取元数据
-        fetcher = MetaFetcher(self.max_concurrency)
-        url_to_meta = await fetcher.get_all(url_list)
-        
-        # 创建书签对象
-        bookmarks = []
+        # 去重后获取元数据（保持顺序），重复书签复用同一份元数据；
+        # 构建书签对象时仍遍历原始列表以保留顺序和重复项
+        unique_urls = list(dict.fromkeys(url_list))
+
+        # 先查持久化缓存，只对未缓存的URL发起网络请求，
+        # 重复运行同一书签文件时网络开销只取决于新增URL数量
+        url_to_meta = {}
+        missing = []
+        for url in unique_urls:
+            cached = meta_cache.get(url)
+            if cached is not None:
+                url_to_meta[url] = cached
+            else:
+                missing.append(url)
+        if url_to_meta:
+            logger.info(f"持久化缓存命中 {len(url_to_meta)} 个URL")
+
+        if missing:
+            fetcher = MetaFetcher(self.max_concurrency)
+            try:
+                fetched = await fetcher.get_all(missing)
+            finally:
+                # 关闭共享会话，避免泄漏aiohttp连接池
+                await fetcher.close()
+            for url, meta in fetched.items():
+                # 获取失败的默认值不持久化，下次运行仍会重试
+                if meta != ("无标题", "无描述"):
+                    meta_cache.put(url, meta[0], meta[1])
+            url_to_meta.update(fetched)
+        
+        # 创建书签对象（预分配列表，避免追加过程中的扩容搬迁）
+        bookmarks: List[Bookmark] = [None] * len(url_list)
         failed_bookmarks = []
-        
-        for url in url_list:
-            title, desc = url_to_meta.get(url, ("无标题", "无描述"))
+
+        for i, url in enumerate(url_list):
+            meta = url_to_meta.get(url, _MISSING)
+            title, desc = meta
             bookmark = Bookmark(title=title, url=url, description=desc)
-            bookmarks.append(bookmark)
-            
-            # 检查是否获取元数据失败
-            if title == "无标题" and desc == "无描述":
+            bookmarks[i] = bookmark
+
+            # 检查是否获取元数据失败（获取器的失败默认值与哨兵值相等）
+            if meta == _MISSING:
                 failed_bookmarks.append(bookmark)
         
         if failed_bookmarks:
@@ -103,22 +174,8 @@ class BookmarkParser:
             URL列表
         """
         logger.info("开始提取URL列表")
-        
-        try:
-            with open(self.html_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            logger.error(f"读取书签文件失败: {e}")
-            raise
-        
-        soup = BeautifulSoup(content, 'html.parser')
-        links = soup.find_all('a')
-        
-        url_list = []
-        for link in links:
-            href = link.get('href', '').strip()
-            if href.startswith(('http', 'https')):
-                url_list.append(href)
-        
+
+        url_list = list(_extract_urls(str(self.html_path), self.html_path.stat().st_mtime))
+
         logger.info(f"提取到 {len(url_list)} 个有效URL")
         return url_list
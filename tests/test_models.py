@@ -2,7 +2,7 @@
 数据模型测试
 """
 import pytest
-from models.bookmark import Bookmark, BookmarkPydantic, ClassifiedBookmark
+from models.bookmark import Bookmark, ClassifiedBookmark
 
 
 class TestBookmark:
@@ -40,33 +40,6 @@ class TestBookmark:
         assert "文件夹" in repr_str
 
 
-class TestBookmarkPydantic:
-    """Pydantic书签模型测试"""
-    
-    def test_bookmark_pydantic_creation(self):
-        """测试Pydantic书签创建"""
-        bookmark = BookmarkPydantic(
-            title="测试网站",
-            url="https://example.com",
-            description="这是一个测试网站"
-        )
-        
-        assert bookmark.title == "测试网站"
-        assert bookmark.url == "https://example.com"
-        assert bookmark.description == "这是一个测试网站"
-    
-    def test_bookmark_pydantic_defaults(self):
-        """测试Pydantic书签默认值"""
-        bookmark = BookmarkPydantic(
-            title="测试网站",
-            url="https://example.com"
-        )
-        
-        assert bookmark.description == ""
-        assert bookmark.folder == ""
-        assert bookmark.add_date is None
-
-
 class TestClassifiedBookmark:
     """分类书签模型测试"""
     
@@ -83,3 +56,29 @@ class TestClassifiedBookmark:
         assert classified.description == "这是一个测试网站"
         assert classified.category == "编程"
         assert classified.url == "https://example.com"
+
+    def test_classified_bookmark_invalid_url(self):
+        """测试无效URL在构造时抛出异常"""
+        with pytest.raises(ValueError):
+            ClassifiedBookmark(
+                name="测试网站",
+                description="描述",
+                category="编程",
+                url="javascript:void(0)"
+            )
+
+    def test_classified_bookmark_to_dict(self):
+        """测试分类书签转字典"""
+        classified = ClassifiedBookmark(
+            name="测试网站",
+            description="描述",
+            category="编程",
+            url="https://example.com"
+        )
+
+        assert classified.to_dict() == {
+            "name": "测试网站",
+            "description": "描述",
+            "category": "编程",
+            "url": "https://example.com",
+        }
@@ -0,0 +1,74 @@
+"""
+并发控制模块
+包含支持动态调整并发上限的并发原语
+"""
+import asyncio
+
+from utils.logger import get_logger
+
+logger = get_logger("bookmark_organizer")
+
+
+class DynamicSemaphore:
+    """
+    支持动态调整并发上限的信号量
+
+    asyncio.Semaphore在构造后无法安全地调整容量（直接改写_value是未定义行为），
+    这里用Condition保护的计数器实现，可在运行中通过set_max进行自适应限流。
+    """
+
+    def __init__(self, max_concurrency: int):
+        """
+        初始化动态信号量
+
+        Args:
+            max_concurrency: 初始最大并发数
+        """
+        self._active = 0
+        self._max = max_concurrency
+        self._cond = asyncio.Condition()
+
+    @property
+    def max_concurrency(self) -> int:
+        """当前最大并发数"""
+        return self._max
+
+    @property
+    def active(self) -> int:
+        """当前占用的并发槽位数"""
+        return self._active
+
+    async def acquire(self) -> None:
+        """获取一个并发槽位，槽位耗尽时等待"""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._max)
+            self._active += 1
+
+    async def release(self) -> None:
+        """释放一个并发槽位并唤醒一个等待者"""
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def set_max(self, max_concurrency: int) -> None:
+        """
+        调整最大并发数
+
+        Args:
+            max_concurrency: 新的最大并发数
+        """
+        async with self._cond:
+            increased = max_concurrency > self._max
+            self._max = max_concurrency
+            # 上限增大时唤醒所有等待者重新检查条件
+            if increased:
+                self._cond.notify_all()
+
+        logger.info(f"并发上限已调整为: {max_concurrency}")
+
+    async def __aenter__(self) -> "DynamicSemaphore":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.release()
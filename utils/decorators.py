@@ -6,6 +6,8 @@ import time
 import functools
 import asyncio
 import logging
+import os
+import random
 from typing import Any, Callable, TypeVar, ParamSpec
 
 # 类型变量
@@ -15,6 +17,14 @@ P = ParamSpec('P')
 # 获取logger
 logger = logging.getLogger(__name__)
 
+# 模块级绑定单调计时器，省去每次调用的属性链查找；
+# perf_counter不受系统时钟调整影响，适合短区间计时
+_perf = time.perf_counter
+
+# 计时开关：设置环境变量 BOOKMARK_TIMING=1 启用性能监控日志，
+# 关闭时timing/async_timing原样返回被装饰函数，零运行时开销
+_TIMING_ENABLED = bool(int(os.environ.get('BOOKMARK_TIMING', '0')))
+
 
 def timing(func: Callable[P, T]) -> Callable[P, T]:
     """
@@ -24,25 +34,32 @@ def timing(func: Callable[P, T]) -> Callable[P, T]:
         func: 要装饰的函数
         
     Returns:
-        装饰后的函数
+        装饰后的函数（计时未启用时原样返回）
     """
+    if not _TIMING_ENABLED:
+        return func
+
+    # 装饰时绑定为局部变量，省去每次调用的属性查找
+    _debug = logger.debug
+    _info = logger.info
+    _error = logger.error
+    _name = func.__name__
+
     @functools.wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        start_time = time.time()
-        logger.info(f"⏳ 开始执行函数：{func.__name__}")
-        
+        start_time = _perf()
+        _debug("⏳ 开始执行函数：%s", _name)
+
         try:
             result = func(*args, **kwargs)
-            end_time = time.time()
-            duration = end_time - start_time
-            logger.info(f"✅ 函数 {func.__name__} 执行完毕，用时：{duration:.2f} 秒")
+            duration = _perf() - start_time
+            _info("✅ 函数 %s 执行完毕，用时：%.2f 秒", _name, duration)
             return result
         except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
-            logger.error(f"❌ 函数 {func.__name__} 执行失败，用时：{duration:.2f} 秒，错误：{e}")
+            duration = _perf() - start_time
+            _error("❌ 函数 %s 执行失败，用时：%.2f 秒，错误：%s", _name, duration, e)
             raise
-    
+
     return wrapper
 
 
@@ -54,36 +71,46 @@ def async_timing(func: Callable[P, Any]) -> Callable[P, Any]:
         func: 要装饰的异步函数
         
     Returns:
-        装饰后的异步函数
+        装饰后的异步函数（计时未启用时原样返回）
     """
+    if not _TIMING_ENABLED:
+        return func
+
+    # 装饰时绑定为局部变量，省去每次调用的属性查找
+    _debug = logger.debug
+    _info = logger.info
+    _error = logger.error
+    _name = func.__name__
+
     @functools.wraps(func)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
-        start_time = time.time()
-        logger.info(f"⏳ 开始执行异步函数：{func.__name__}")
-        
+        start_time = _perf()
+        _debug("⏳ 开始执行异步函数：%s", _name)
+
         try:
             result = await func(*args, **kwargs)
-            end_time = time.time()
-            duration = end_time - start_time
-            logger.info(f"✅ 异步函数 {func.__name__} 执行完毕，用时：{duration:.2f} 秒")
+            duration = _perf() - start_time
+            _info("✅ 异步函数 %s 执行完毕，用时：%.2f 秒", _name, duration)
             return result
         except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
-            logger.error(f"❌ 异步函数 {func.__name__} 执行失败，用时：{duration:.2f} 秒，错误：{e}")
+            duration = _perf() - start_time
+            _error("❌ 异步函数 %s 执行失败，用时：%.2f 秒，错误：%s", _name, duration, e)
             raise
-    
+
     return wrapper
 
 
-def retry(max_attempts: int = 3, delay: float = 1.0):
+def retry(max_attempts: int = 3, delay: float = 1.0, max_delay: float = 30.0):
     """
     重试装饰器
-    
+
+    重试间隔按指数退避并叠加随机抖动，避免多个任务同步重试造成的请求风暴
+
     Args:
         max_attempts: 最大重试次数
-        delay: 重试间隔(秒)
-        
+        delay: 基础重试间隔(秒)
+        max_delay: 单次重试间隔上限(秒)
+
     Returns:
         装饰器函数
     """
@@ -91,31 +118,35 @@ def retry(max_attempts: int = 3, delay: float = 1.0):
         @functools.wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
             last_exception = None
-            
+
             for attempt in range(max_attempts):
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
                     last_exception = e
                     if attempt < max_attempts - 1:
-                        logger.warning(f"函数 {func.__name__} 第 {attempt + 1} 次尝试失败：{e}，{delay}秒后重试")
-                        time.sleep(delay)
+                        wait = min(delay * (2 ** attempt) + random.uniform(0, delay), max_delay)
+                        logger.warning("函数 %s 第 %d 次尝试失败：%s，%.1f秒后重试", func.__name__, attempt + 1, e, wait)
+                        time.sleep(wait)
             
-            logger.error(f"函数 {func.__name__} 在 {max_attempts} 次尝试后仍然失败")
+            logger.error("函数 %s 在 %d 次尝试后仍然失败", func.__name__, max_attempts)
             raise last_exception
         
         return wrapper
     return decorator
 
 
-def async_retry(max_attempts: int = 3, delay: float = 1.0):
+def async_retry(max_attempts: int = 3, delay: float = 1.0, max_delay: float = 30.0):
     """
     异步重试装饰器
-    
+
+    重试间隔按指数退避并叠加随机抖动，避免多个任务同步重试造成的请求风暴
+
     Args:
         max_attempts: 最大重试次数
-        delay: 重试间隔(秒)
-        
+        delay: 基础重试间隔(秒)
+        max_delay: 单次重试间隔上限(秒)
+
     Returns:
         装饰器函数
     """
@@ -123,17 +154,18 @@ def async_retry(max_attempts: int = 3, delay: float = 1.0):
         @functools.wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
             last_exception = None
-            
+
             for attempt in range(max_attempts):
                 try:
                     return await func(*args, **kwargs)
                 except Exception as e:
                     last_exception = e
                     if attempt < max_attempts - 1:
-                        logger.warning(f"异步函数 {func.__name__} 第 {attempt + 1} 次尝试失败：{e}，{delay}秒后重试")
-                        await asyncio.sleep(delay)
+                        wait = min(delay * (2 ** attempt) + random.uniform(0, delay), max_delay)
+                        logger.warning("异步函数 %s 第 %d 次尝试失败：%s，%.1f秒后重试", func.__name__, attempt + 1, e, wait)
+                        await asyncio.sleep(wait)
             
-            logger.error(f"异步函数 {func.__name__} 在 {max_attempts} 次尝试后仍然失败")
+            logger.error("异步函数 %s 在 %d 次尝试后仍然失败", func.__name__, max_attempts)
             raise last_exception
         
         return wrapper
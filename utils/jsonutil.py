@@ -0,0 +1,59 @@
+"""
+JSON工具模块
+优先使用orjson进行JSON解析，未安装时回退到标准库json
+"""
+from typing import Any
+
+try:
+    import orjson as _orjson
+
+    def loads(data: Any) -> Any:
+        """
+        解析JSON字符串或字节串（orjson实现）
+
+        Args:
+            data: JSON字符串或字节串
+
+        Returns:
+            解析后的Python对象
+        """
+        return _orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """
+        序列化为JSON字符串（orjson实现）
+
+        Args:
+            obj: 要序列化的Python对象
+
+        Returns:
+            JSON字符串
+        """
+        return _orjson.dumps(obj).decode("utf-8")
+
+except ImportError:  # pragma: no cover - 取决于运行环境
+    import json as _json
+
+    def loads(data: Any) -> Any:
+        """
+        解析JSON字符串或字节串（标准库实现）
+
+        Args:
+            data: JSON字符串或字节串
+
+        Returns:
+            解析后的Python对象
+        """
+        return _json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """
+        序列化为JSON字符串（标准库实现）
+
+        Args:
+            obj: 要序列化的Python对象
+
+        Returns:
+            JSON字符串
+        """
+        return _json.dumps(obj, ensure_ascii=False)
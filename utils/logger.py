@@ -2,10 +2,21 @@
 日志配置模块
 统一配置项目的日志系统
 """
+import functools
 import logging
+import logging.handlers
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+# 关闭LogRecord中用不到的线程/进程信息采集，降低每条日志的构建成本
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# 记录每个日志器已生效的配置参数，
+# 相同参数的重复setup_logger调用直接返回，不重建处理器
+_configured: Dict[str, Tuple] = {}
 
 
 def setup_logger(
@@ -28,16 +39,25 @@ def setup_logger(
     """
     if format_string is None:
         format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
+
     # 创建日志记录器
     logger = logging.getLogger(name)
+
+    # 幂等保护：相同参数的重复调用直接复用现有处理器
+    params = (level, log_file, format_string)
+    if _configured.get(name) == params:
+        return logger
+    _configured[name] = params
+
     logger.setLevel(level)
-    
-    # 清除现有的处理器
+    # 处理器直接挂在本日志器上，跳过向root的二次分发
+    logger.propagate = False
+
+    # 清除现有的处理器（参数变化时重新配置）
     logger.handlers.clear()
-    
-    # 创建格式化器
-    formatter = logging.Formatter(format_string)
+
+    # 创建格式化器（短日期格式降低每条记录的strftime开销）
+    formatter = logging.Formatter(format_string, datefmt="%H:%M:%S")
     
     # 控制台处理器
     console_handler = logging.StreamHandler(sys.stdout)
@@ -54,23 +74,33 @@ def setup_logger(
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        # 内存缓冲批量落盘，ERROR及以上立即刷出；
+        # logging.shutdown在进程退出时会flush剩余记录
+        memory_handler = logging.handlers.MemoryHandler(
+            capacity=1024,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+        )
+        logger.addHandler(memory_handler)
     
     return logger
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str = "bookmark_organizer") -> logging.Logger:
     """
     获取日志记录器
-    
+
+    首次获取未配置的日志器时按默认参数惰性初始化，
+    避免模块导入阶段就构建处理器；
+    日志器按名称单例，按名称memoize可跳过logging内部的管理器锁
+
     Args:
         name: 日志记录器名称
-        
+
     Returns:
         日志记录器实例
     """
+    if name not in _configured:
+        return setup_logger(name)
     return logging.getLogger(name)
-
-
-# 默认日志配置
-default_logger = setup_logger()